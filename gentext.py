@@ -1,24 +1,152 @@
+import PIL
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import numpy as np
+import functools
 import os
-import colorsys
 import random
 from PIL.ImageColor import getrgb
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Permutation table for Perlin noise, duplicated so lookups never need wrapping
+_PERLIN_PERM = np.tile(np.random.default_rng().permutation(256), 2)
+
+def _maybe_njit(**options):
+    """numba.njit when numba is installed, otherwise keep the plain Python function"""
+    if numba is None:
+        return lambda func: func
+    return numba.njit(**options)
+
+@_maybe_njit(cache=True)
+def _fade(t):
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+@_maybe_njit(cache=True)
+def _lerp(a, b, t):
+    return a + t * (b - a)
+
+@_maybe_njit(cache=True)
+def _grad(h, x, y):
+    # One of the four diagonal gradients (+-1, +-1) picked by the low hash bits
+    return (1 - 2 * (h & 1)) * x + (1 - 2 * ((h >> 1) & 1)) * y
+
+@_maybe_njit(cache=True, fastmath=True)
+def _perlin_point(x, y, octaves, scale, perm):
+    """Fractal Perlin noise in [-1, 1] at (x, y); works on scalars or whole arrays"""
+    total = 0.0
+    norm = 0.0
+    amplitude = 1.0
+    frequency = 1.0 / scale
+    for _ in range(octaves):
+        fx = x * frequency
+        fy = y * frequency
+        x0 = np.floor(fx)
+        y0 = np.floor(fy)
+        xf = fx - x0
+        yf = fy - y0
+        xi = np.int64(x0) & 255
+        yi = np.int64(y0) & 255
+        
+        a = perm[xi] + yi
+        b = perm[xi + 1] + yi
+        u = _fade(xf)
+        v = _fade(yf)
+        bottom = _lerp(_grad(perm[a], xf, yf), _grad(perm[b], xf - 1, yf), u)
+        top = _lerp(_grad(perm[a + 1], xf, yf - 1), _grad(perm[b + 1], xf - 1, yf - 1), u)
+        
+        total = total + _lerp(bottom, top, v) * amplitude
+        norm += amplitude
+        amplitude *= 0.5
+        frequency *= 2
+    return total / norm
+
+@_maybe_njit(parallel=True, fastmath=True, cache=True)
+def _perlin2d_parallel(height, width, octaves, scale, perm):
+    noise = np.empty((height, width), dtype=np.float32)
+    for y in numba.prange(height):
+        for x in range(width):
+            noise[y, x] = _perlin_point(x, y, octaves, scale, perm)
+    return noise
+
+def perlin2d(height, width, octaves=4, scale=128.0):
+    """Multi-octave Perlin noise in [0, 1], threaded with numba when available"""
+    if numba is not None:
+        noise = _perlin2d_parallel(height, width, octaves, scale, _PERLIN_PERM)
+    else:
+        ys, xs = np.mgrid[0:height, 0:width].astype(np.float32)
+        noise = _perlin_point(xs, ys, octaves, scale, _PERLIN_PERM)
+    return np.clip(noise * 0.5 + 0.5, 0, 1)
+
+@functools.lru_cache(maxsize=32)
+def _load_font_cached(font_path, size):
+    """Freetype font loading is slow, so keep loaded fonts around per (path, size)"""
+    return ImageFont.truetype(font_path, size)
+
+@functools.lru_cache(maxsize=8)
+def _load_texture_cached(texture_path, size):
+    """Decode and resize a texture image once per (path, size)"""
+    return Image.open(texture_path).convert('RGB').resize(size, Image.Resampling.LANCZOS)
+
+# Bevel and emboss passes stamped over the base chrome, in order, as (dx, dy, rgba)
+CHROME_BEVEL_PASSES = (
+    # Top highlight (white, screen mode, 100% opacity)
+    (0, -3, (255, 255, 255, 120)),  # Main top highlight
+    (0, -2, (240, 240, 240, 100)),  # Secondary highlight
+    (-1, -2, (220, 220, 220, 80)),  # Left highlight
+    # Bottom shadow (multiply black, 80% opacity as per tutorial)
+    (1, 3, (0, 0, 0, 80)),     # Main bottom shadow
+    (0, 2, (40, 40, 40, 60)),  # Mid shadow
+    (2, 2, (20, 20, 20, 40)),  # Side shadow
+    # Satin effect (dark navy blue multiply, as per tutorial)
+    (1, 1, (20, 30, 80, 100)),
+    (2, 2, (20, 30, 80, 100)),
+    # Very subtle color hints only at edges
+    (-1, 0, (100, 255, 200, 30)),   # Cyan hint on left
+    (1, 0, (200, 100, 255, 30)),    # Purple hint on right
+    (0, -1, (255, 200, 100, 25)),   # Orange hint on top
+    # (0, 0, (180, 180, 180, 255)),  # Final chrome highlight pass
+    # Very bright top edge highlight
+    (0, -1, (255, 255, 255, 140)),
+)
+
+@functools.lru_cache(maxsize=None)
+def glow_offsets(size):
+    """(dx, dy) offsets of a glow: the 8 directions at every distance from 1 to size"""
+    return tuple((dx, dy)
+                 for offset in range(1, size + 1)
+                 for dx in (-offset, 0, offset)
+                 for dy in (-offset, 0, offset)
+                 if dx != 0 or dy != 0)
+
+def is_pillow_simd():
+    """Pillow-SIMD releases carry a .postN suffix on the Pillow version they track"""
+    return '.post' in PIL.__version__
+
 class DaftPunkTextEffect:
+    _simd_warned = False
+    
     def __init__(self, width=800, height=600):
         """Initialize with canvas dimensions"""
         self.width = width
         self.height = height
         self.canvas = Image.new('RGB', (width, height), 'black')
+        self._text_masks = {}
+        
+        # Pillow-SIMD is a drop-in replacement with much faster resize, blur and compositing
+        if not is_pillow_simd() and not DaftPunkTextEffect._simd_warned:
+            DaftPunkTextEffect._simd_warned = True
+            print(f"Warning: running on stock Pillow {PIL.__version__}, not Pillow-SIMD. "
+                  "For faster rendering: pip uninstall pillow && pip install pillow-simd")
         
     def load_texture(self, texture_path="texture.png"):
         """Load and process the texture background"""
         try:
             if os.path.exists(texture_path):
-                texture = Image.open(texture_path).convert('RGB')
                 # Resize to canvas size
-                texture = texture.resize((self.width, self.height), Image.Resampling.LANCZOS)
+                texture = _load_texture_cached(texture_path, (self.width, self.height))
             else:
                 # Generate a noise texture if file doesn't exist
                 texture = self.generate_noise_texture()
@@ -34,60 +162,46 @@ class DaftPunkTextEffect:
     
     def generate_noise_texture(self):
         """Generate a noise texture similar to the tutorial's texture"""
-        # Create noise pattern
-        noise_array = np.random.randint(0, 256, (self.height, self.width, 3), dtype=np.uint8)
-        texture = Image.fromarray(noise_array)
+        # Create a single-channel noise pattern (greyscale, shared by R, G and B)
+        rng = np.random.default_rng()
+        noise_array = rng.integers(0, 256, (self.height, self.width), dtype=np.uint8)
+        texture = Image.fromarray(noise_array, 'L')
         
         # Apply blur to make it smoother
         texture = texture.filter(ImageFilter.GaussianBlur(radius=2))
-        return texture
+        return texture.convert('RGB')
     
     def create_radial_gradient(self, center_x, center_y, radius, inner_color=(255,255,255,255), outer_color=(0,0,0,0)):
         """Create a radial gradient"""
         gradient = Image.new('RGBA', (self.width, self.height), outer_color)
-        draw = ImageDraw.Draw(gradient)
-        
-        # Draw concentric circles for gradient effect
-        steps = 50
-        for i in range(steps):
-            alpha = int(255 * (1 - i/steps))
-            current_radius = radius * i / steps
-            color = (*inner_color[:3], alpha)
-            
-            bbox = [
-                center_x - current_radius, center_y - current_radius,
-                center_x + current_radius, center_y + current_radius
-            ]
-            draw.ellipse(bbox, fill=color)
         
+        # Only the circle's bounding box can differ from outer_color
+        x0 = max(int(center_x - radius), 0)
+        y0 = max(int(center_y - radius), 0)
+        x1 = min(int(center_x + radius) + 1, self.width)
+        y1 = min(int(center_y + radius) + 1, self.height)
+        if x0 >= x1 or y0 >= y1 or radius <= 0:
+            return gradient
+        
+        # Alpha falls off linearly from inner_color's alpha at the center
+        yy, xx = np.ogrid[y0:y1, x0:x1]
+        dist = np.sqrt((xx - center_x) ** 2 + (yy - center_y) ** 2).astype(np.float32)
+        inside = dist < radius
+        
+        rgba = np.empty((y1 - y0, x1 - x0, 4), dtype=np.uint8)
+        rgba[...] = outer_color
+        rgba[inside, :3] = inner_color[:3]
+        peak_alpha = inner_color[3] if len(inner_color) > 3 else 255
+        rgba[inside, 3] = np.clip(peak_alpha * (1 - dist[inside] / radius), 0, 255).astype(np.uint8)
+        
+        gradient.paste(Image.fromarray(rgba, 'RGBA'), (x0, y0))
         return gradient
     
     def create_clouds_layer(self):
         """Create a clouds-like layer using noise"""
-        # Generate cloud-like pattern using multiple noise layers
-        clouds = Image.new('L', (self.width, self.height))
-        
-        # Create multiple octaves of noise
-        for octave in range(4):
-            scale = 2 ** octave
-            noise_width = self.width // scale
-            noise_height = self.height // scale
-            
-            # Generate noise at this scale
-            noise = np.random.randint(0, 256, (noise_height, noise_width), dtype=np.uint8)
-            noise_img = Image.fromarray(noise, 'L')
-            
-            # Resize and blend
-            noise_img = noise_img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-            
-            if octave == 0:
-                clouds = noise_img
-            else:
-                # Blend with previous octaves
-                clouds = Image.blend(clouds, noise_img, 0.5)
-        
-        # Apply blur
-        clouds = clouds.filter(ImageFilter.GaussianBlur(radius=1))
+        # Multi-octave Perlin noise gives smooth, cloud-like structure directly
+        noise = perlin2d(self.height, self.width, octaves=4)
+        clouds = Image.fromarray((noise * 255).astype(np.uint8), 'L')
         return clouds.convert('RGB')
     
     def setup_background(self, texture_path=None):
@@ -100,7 +214,7 @@ class DaftPunkTextEffect:
         """Load the font or fallback to default"""
         try:
             if os.path.exists(font_path):
-                return ImageFont.truetype(font_path, size)
+                return _load_font_cached(font_path, size)
             else:
                 print(f"Font file {font_path} not found, using default font")
                 return ImageFont.load_default()
@@ -108,150 +222,170 @@ class DaftPunkTextEffect:
             print(f"Error loading font: {e}")
             return ImageFont.load_default()
     
+    def get_text_mask(self, text, font):
+        """Rasterize the text once and reuse the mask for every effect pass
+        
+        Returns (mask, left, top): the mask covers the text's bounding box, whose
+        top-left corner is at (left, top) relative to the drawing position.
+        """
+        key = (text, font)
+        if key not in self._text_masks:
+            # Lay the lines out once ourselves, the same way Pillow's multiline text does
+            lines = text.split('\n')
+            line_spacing = font.getbbox('A')[3] + 4
+            line_bboxes = [font.getbbox(line) for line in lines]
+            left = min(bbox[0] for bbox in line_bboxes)
+            top = line_bboxes[0][1]
+            right = max(bbox[2] for bbox in line_bboxes)
+            bottom = line_spacing * (len(lines) - 1) + line_bboxes[-1][3]
+            
+            mask = Image.new('L', (right - left, bottom - top), 0)
+            draw = ImageDraw.Draw(mask)
+            for i, line in enumerate(lines):
+                draw.text((-left, i * line_spacing - top), line, fill=255, font=font)
+            self._text_masks[key] = (mask, left, top)
+        return self._text_masks[key]
+    
+    def paste_text(self, canvas, text_mask, x, y, color):
+        """Stamp a cached text mask onto the canvas at (x, y) in the given color"""
+        mask, left, top = text_mask
+        canvas.paste(Image.new(canvas.mode, mask.size, color), (x + left, y + top), mask)
+    
+    def create_text_canvas(self, text_mask, x, y, padding):
+        """Create a transparent canvas covering only the text at (x, y) plus padding
+        
+        Returns the canvas and the position of its top-left corner on the main canvas.
+        """
+        mask, left, top = text_mask
+        canvas = Image.new('RGBA', (mask.width + padding*2, mask.height + padding*2), (0,0,0,0))
+        return canvas, (x + left - padding, y + top - padding)
+    
     def create_chrome_text_with_bevel(self, text, font, x, y):
-        """Create chrome text with heavy bevel and emboss effects like the tutorial"""
-        # Create a larger canvas for effects
-        effect_padding = 80
-        text_canvas = Image.new('RGBA', 
-                               (self.width + effect_padding*2, self.height + effect_padding*2), 
-                               (0,0,0,0))
-        draw = ImageDraw.Draw(text_canvas)
-        
-        # Adjust position for padding
-        text_x = x + effect_padding
-        text_y = y + effect_padding
+        """Create chrome text with heavy bevel and emboss effects like the tutorial
+        
+        Returns the layer and its (x, y) origin on the main canvas.
+        """
+        # Create a canvas around the text with room for the effects
+        effect_padding = 16
+        text_mask = self.get_text_mask(text, font)
+        text_canvas, origin = self.create_text_canvas(text_mask, x, y, effect_padding)
+        
+        # Adjust position for the canvas origin
+        text_x = x - origin[0]
+        text_y = y - origin[1]
         
         # Create main drop shadow (black, as per tutorial: -30 angle, 5 distance)
         shadow_offset_x = 3  # Approximating -30 degree angle
         shadow_offset_y = 5
-        draw.text((text_x + shadow_offset_x, text_y + shadow_offset_y), text, 
-                 fill=(0, 0, 0, 200), font=font)
+        self.paste_text(text_canvas, text_mask, text_x + shadow_offset_x, text_y + shadow_offset_y,
+                        (0, 0, 0, 200))
         
         # Inner glow (black, as per tutorial)
         inner_glow_color = (0, 0, 0, 70)  # 70% opacity black
-        for offset in range(1, 5):  # Size 4
-            for dx in [-offset, 0, offset]:
-                for dy in [-offset, 0, offset]:
-                    if dx != 0 or dy != 0:
-                        draw.text((text_x + dx, text_y + dy), text, 
-                                fill=inner_glow_color, font=font)
+        glow_mask = self.create_glow_mask(text_mask, text_x, text_y, text_canvas.size, size=4)  # Size 4
+        text_canvas.paste(inner_glow_color, mask=glow_mask)
         
         # Base chrome color (medium gray)
         base_chrome = (140, 140, 140, 255)
-        draw.text((text_x, text_y), text, fill=base_chrome, font=font)
+        self.paste_text(text_canvas, text_mask, text_x, text_y, base_chrome)
         
         # Bevel and Emboss effects (as per tutorial: 20% depth, 10px size)
-        # Top highlight (white, screen mode, 100% opacity)
-        top_highlights = [
-            (0, -3, (255, 255, 255, 120)),  # Main top highlight
-            (0, -2, (240, 240, 240, 100)),  # Secondary highlight
-            (-1, -2, (220, 220, 220, 80)),  # Left highlight
-        ]
-        
-        for offset_x, offset_y, color in top_highlights:
-            draw.text((text_x + offset_x, text_y + offset_y), text, fill=color, font=font)
-        
-        # Bottom shadow (multiply black, 80% opacity as per tutorial)
-        bottom_shadows = [
-            (1, 3, (0, 0, 0, 80)),     # Main bottom shadow
-            (0, 2, (40, 40, 40, 60)),  # Mid shadow
-            (2, 2, (20, 20, 20, 40)),  # Side shadow
-        ]
-        
-        for offset_x, offset_y, color in bottom_shadows:
-            draw.text((text_x + offset_x, text_y + offset_y), text, fill=color, font=font)
-        
-        # Satin effect (dark blue multiply, as per tutorial)
-        satin_color = (20, 30, 80, 100)  # Dark navy blue
-        for offset in range(1, 3):
-            draw.text((text_x + offset, text_y + offset), text, fill=satin_color, font=font)
-        
-        # Add very subtle color hints only at edges (much less than before)
-        edge_colors = [
-            (-1, 0, (100, 255, 200, 30)),   # Cyan hint on left
-            (1, 0, (200, 100, 255, 30)),    # Purple hint on right  
-            (0, -1, (255, 200, 100, 25)),   # Orange hint on top
-        ]
-        
-        for offset_x, offset_y, color in edge_colors:
-            draw.text((text_x + offset_x, text_y + offset_y), text, fill=color, font=font)
-        
-        # # Final chrome highlight pass
-        # final_chrome = (180, 180, 180, 255)
-        # draw.text((text_x, text_y), text, fill=final_chrome, font=font)
-        
-        # Very bright top edge highlight
-        draw.text((text_x, text_y - 1), text, fill=(255, 255, 255, 140), font=font)
+        for offset_x, offset_y, color in CHROME_BEVEL_PASSES:
+            self.paste_text(text_canvas, text_mask, text_x + offset_x, text_y + offset_y, color)
         
-        # Crop back to original size
-        text_canvas = text_canvas.crop((effect_padding, effect_padding, 
-                                      self.width + effect_padding, self.height + effect_padding))
-        
-        return text_canvas
+        return text_canvas, origin
+    
+    def create_glow_mask(self, text_mask, x, y, canvas_size, size=5, passes=1):
+        """Create the coverage mask of a glow halo around the text by dilating a single text mask
+        
+        Pasting a color through it matches drawing the text at every glow offset in that
+        color, `passes` times over.
+        """
+        mask = Image.new('L', canvas_size, 0)
+        self.paste_text(mask, text_mask, x, y, 255)
+        
+        # Spread the mask to every (dx, dy) the tutorial's offset redraws covered.
+        # Stacking draws of one color leaves 1 - prod(1 - coverage) of it on each pixel
+        uncovered = 1 - np.asarray(mask, dtype=np.float32) / 255
+        remaining = np.ones_like(uncovered)
+        height, width = uncovered.shape
+        for dx, dy in glow_offsets(size):
+            dst = remaining[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)]
+            src = uncovered[max(-dy, 0):height + min(-dy, 0), max(-dx, 0):width + min(-dx, 0)]
+            np.multiply(dst, src, out=dst)
+        np.power(remaining, passes, out=remaining)
+        
+        halo = (1 - remaining) * 255 + 0.5
+        return Image.fromarray(halo.astype(np.uint8), 'L')
     
     def create_colored_shadow_layer(self, text, font, text_x, text_y):
-        """Create the colored shadow layer as per tutorial (3 layers of text)"""
-        shadow_canvas = Image.new('RGBA', (self.width, self.height), (0,0,0,0))
-        draw = ImageDraw.Draw(shadow_canvas)
+        """Create the colored shadow layer as per tutorial (3 layers of text)
+        
+        Returns the layer and its (x, y) origin on the main canvas.
+        """
+        text_mask = self.get_text_mask(text, font)
         
         # Shadow layer 2: Black shadow (3 pixels down, 3 pixels right as per tutorial)
         shadow_x = text_x + 3
         shadow_y = text_y + 3
-        draw.text((shadow_x, shadow_y), text, fill=(0, 0, 0, 255), font=font)
+        shadow_canvas, origin = self.create_text_canvas(text_mask, shadow_x, shadow_y, 0)
+        self.paste_text(shadow_canvas, text_mask, shadow_x - origin[0], shadow_y - origin[1],
+                        (0, 0, 0, 255))
         
-        return shadow_canvas
+        return shadow_canvas, origin
     
     def create_rainbow_colored_layer(self, text, font, text_x, text_y):
-        """Create the third layer with rainbow colors and effects"""
-        rainbow_canvas = Image.new('RGBA', (self.width, self.height), (0,0,0,0))
+        """Create the third layer with rainbow colors and effects
         
-        # Create rainbow gradient
-        rainbow_gradient = Image.new('RGB', (self.width, self.height))
-        for x in range(self.width):
-            hue = x / self.width
-            rgb = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-            color = tuple(int(c * 255) for c in rgb)
-            for y in range(self.height):
-                rainbow_gradient.putpixel((x, y), color)
-        
-        # Create text mask
-        text_mask = Image.new('L', (self.width, self.height), 0)
-        mask_draw = ImageDraw.Draw(text_mask)
+        Returns the layer and its (x, y) origin on the main canvas.
+        """
+        cached_mask = self.get_text_mask(text, font)
         
         # Position for third layer (3 pixels right, 3 pixels down from shadow)
         rainbow_x = text_x + 6  # 3 from main + 3 more
         rainbow_y = text_y + 6  # 3 from main + 3 more
-        mask_draw.text((rainbow_x, rainbow_y), text, fill=255, font=font)
+        rainbow_canvas, origin = self.create_text_canvas(cached_mask, rainbow_x, rainbow_y, 16)
+        layer_width, layer_height = rainbow_canvas.size
+        
+        # Create rainbow gradient
+        # Hue sweeps left to right across the main canvas at full saturation/value
+        # (HSV -> RGB, vectorized), evaluated only for the columns this layer covers
+        hues = np.arange(origin[0], origin[0] + layer_width, dtype=np.float32) / self.width
+        sector = np.floor(hues * 6).astype(int) % 6
+        f = hues * 6 - np.floor(hues * 6)
+        v = np.ones_like(f)
+        p = np.zeros_like(f)
+        q = 1 - f
+        t = f
+        r = np.choose(sector, [v, q, p, p, t, v])
+        g = np.choose(sector, [t, v, v, q, p, p])
+        b = np.choose(sector, [p, p, t, v, v, q])
+        row = (np.stack([r, g, b], axis=-1) * 255).astype(np.uint8)
+        gradient = np.broadcast_to(row[None, :, :], (layer_height, layer_width, 3))
+        rainbow_gradient = Image.fromarray(np.ascontiguousarray(gradient), 'RGB')
+        
+        # Create text mask
+        rainbow_x -= origin[0]
+        rainbow_y -= origin[1]
+        text_mask = Image.new('L', rainbow_canvas.size, 0)
+        self.paste_text(text_mask, cached_mask, rainbow_x, rainbow_y, 255)
         
         # Apply rainbow to text shape
         rainbow_canvas.paste(rainbow_gradient, mask=text_mask)
         
         # Add outer glow (white, overlay mode, as per tutorial)
-        glow_canvas = Image.new('RGBA', (self.width, self.height), (0,0,0,0))
-        glow_draw = ImageDraw.Draw(glow_canvas)
-        
-        # Outer glow with white color, size 5
+        # and inner glow (white, overlay mode, size 5): both use the same color and
+        # offsets, so they are one glow mask drawn twice over
         glow_color = (255, 255, 255, 100)
-        for offset in range(1, 6):  # Size 5
-            for dx in [-offset, 0, offset]:
-                for dy in [-offset, 0, offset]:
-                    if dx != 0 or dy != 0:
-                        glow_draw.text((rainbow_x + dx, rainbow_y + dy), text, 
-                                     fill=glow_color, font=font)
-        
-        # Inner glow (white, overlay mode, size 5)
-        inner_glow_color = (255, 255, 255, 100)
-        for offset in range(1, 6):
-            for dx in [-offset, 0, offset]:
-                for dy in [-offset, 0, offset]:
-                    if dx != 0 or dy != 0:
-                        glow_draw.text((rainbow_x + dx, rainbow_y + dy), text, 
-                                     fill=inner_glow_color, font=font)
+        glow_mask = self.create_glow_mask(cached_mask, rainbow_x, rainbow_y, rainbow_canvas.size,
+                                          size=5, passes=2)
+        glow_canvas = Image.new('RGBA', rainbow_canvas.size, (0,0,0,0))
+        glow_canvas.paste(glow_color, mask=glow_mask)
         
         # Combine rainbow text with glows
-        result_canvas = Image.alpha_composite(glow_canvas, rainbow_canvas.convert('RGBA'))
+        result_canvas = Image.alpha_composite(glow_canvas, rainbow_canvas)
         
-        return result_canvas
+        return result_canvas, origin
     
     def add_subtle_lighting(self):
         """Add subtle lighting effects instead of stars"""
@@ -275,6 +409,55 @@ class DaftPunkTextEffect:
         
         return lighting_layer
     
+    def composite_layers(self, background, layers):
+        """Alpha-composite (layer, (x, y)) pairs, bottom to top, over an opaque background
+        
+        Returns the composited image as a float32 RGB array, ready for further in-place work.
+        """
+        # The background is opaque, so the accumulator stays opaque (RGB only) and the
+        # "over" operator reduces to out += (layer_rgb - out) * layer_alpha
+        out = np.array(background, dtype=np.float32)
+        for layer, (x, y) in layers:
+            # Only blend the part of the layer that lands on the canvas
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + layer.width, self.width), min(y + layer.height, self.height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            layer_arr = np.asarray(layer.crop((x0 - x, y0 - y, x1 - x, y1 - y)), dtype=np.float32)
+            region = out[y0:y1, x0:x1]
+            
+            rgb = layer_arr[..., :3]
+            alpha = layer_arr[..., 3:4]
+            np.multiply(alpha, 1 / 255, out=alpha)
+            np.subtract(rgb, region, out=rgb)
+            np.multiply(rgb, alpha, out=rgb)
+            np.add(region, rgb, out=region)
+        
+        return out
+    
+    def enhance_contrast_and_color(self, arr, contrast=1.2, color=1.3):
+        """ImageEnhance.Contrast followed by ImageEnhance.Color, fused into one float pass
+        
+        Works in place on a float32 RGB array and returns the final RGB image.
+        """
+        np.clip(arr, 0, 255, out=arr)
+        luma_weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+        
+        # Contrast blends against the mean grey level of the whole image
+        mean = float((arr @ luma_weights).mean())
+        np.subtract(arr, mean, out=arr)
+        np.multiply(arr, contrast, out=arr)
+        np.add(arr, mean, out=arr)
+        np.clip(arr, 0, 255, out=arr)
+        
+        # Color blends each pixel against its own greyscale value
+        luma = (arr @ luma_weights)[..., None]
+        np.subtract(arr, luma, out=arr)
+        np.multiply(arr, color, out=arr)
+        np.add(arr, luma + 0.5, out=arr)
+        np.clip(arr, 0, 255, out=arr)
+        return Image.fromarray(arr.astype(np.uint8), 'RGB')
+    
 
     
     def create_daft_punk_effect(self, text="daft punk", font_path="Daft Font.TTF", 
@@ -291,11 +474,9 @@ class DaftPunkTextEffect:
         print("Creating chrome text with heavy bevel effects...")
         font = self.load_font(font_path, size=100)
         
-        # Calculate text position (center)
-        temp_draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
-        bbox = temp_draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        # Calculate text position (center) from the cached text mask's bounding box
+        text_mask, _, _ = self.get_text_mask(text, font)
+        text_width, text_height = text_mask.size
         
         text_x = (self.width - text_width) // 2
         text_y = (self.height - text_height) // 2
@@ -303,19 +484,18 @@ class DaftPunkTextEffect:
         # Step 3: Create the 3 text layers as per tutorial
         
         # Layer 1: Main chrome text with all effects
-        main_chrome_text = self.create_chrome_text_with_bevel(text, font, text_x, text_y)
+        main_chrome_text, chrome_origin = self.create_chrome_text_with_bevel(text, font, text_x, text_y)
         
         # Layer 2: Black shadow layer (offset)
         print("Creating black shadow layer...")
-        black_shadow = self.create_colored_shadow_layer(text, font, text_x, text_y)
+        black_shadow, shadow_origin = self.create_colored_shadow_layer(text, font, text_x, text_y)
         
         # Layer 3: Rainbow colored layer with effects (further offset)
         print("Creating rainbow colored layer...")
-        rainbow_layer = self.create_rainbow_colored_layer(text, font, text_x, text_y)
+        rainbow_layer, rainbow_origin = self.create_rainbow_colored_layer(text, font, text_x, text_y)
         
         # Step 4: Combine all layers in proper order (as per tutorial)
         print("Combining layers...")
-        result = background.convert('RGBA')
         
         # Layer order from bottom to top:
         # 1. Rainbow layer (bottom/back)
@@ -324,24 +504,21 @@ class DaftPunkTextEffect:
         rainbow_alpha = rainbow_reduced.split()[-1]
         rainbow_alpha = ImageEnhance.Brightness(rainbow_alpha).enhance(0.7)  # Reduce some brightness
         rainbow_reduced.putalpha(rainbow_alpha)
-        result = Image.alpha_composite(result, rainbow_reduced)
         
         # 2. Black shadow layer (middle)
-        result = Image.alpha_composite(result, black_shadow)
-        
         # 3. Main chrome text (top)
-        result = Image.alpha_composite(result, main_chrome_text)
+        result_arr = self.composite_layers(background, [
+            (rainbow_reduced, rainbow_origin),
+            (black_shadow, shadow_origin),
+            (main_chrome_text, chrome_origin),
+        ])
         
         # Final adjustments - enhance contrast and colors
-        result = result.convert('RGB')
-        enhancer = ImageEnhance.Contrast(result)
-        result = enhancer.enhance(1.2)
-        
-        enhancer = ImageEnhance.Color(result)
-        result = enhancer.enhance(1.3)
+        result = self.enhance_contrast_and_color(result_arr, contrast=1.2, color=1.3)
         
         # Save result
-        result.save(output_path, 'PNG', quality=95)
+        # Fast zlib level: the output is an intermediate texture, size matters less than speed
+        result.save(output_path, 'PNG', compress_level=1)
         print(f"Daft Punk effect saved as: {output_path}")
         
         return result
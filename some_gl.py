@@ -4,6 +4,8 @@ from OpenGL.GL import *
 from OpenGL.GLU import *
 from pygame.locals import *
 import math
+import ctypes
+import functools
 from PIL import Image
 import requests
 from io import BytesIO
@@ -27,47 +29,58 @@ glShadeModel(GL_SMOOTH)
 
 # --- Texture Loading Functions ---
 
-def load_texture(path):
+def open_image(path):
     """
-    Downloads and loads a texture from a URL or a local file.
-    Returns a fallback texture if the load fails.
+    Downloads or opens an image from a URL or a local file.
     The function checks if the path starts with "http:" to determine if it's a URL.
     """
+    if path.startswith("http:"):
+        print(f"Loading texture from URL: {path}")
+        response = requests.get(path)
+        return Image.open(BytesIO(response.content))
+    print(f"Loading texture from local file: {path}")
+    return Image.open(path)
+
+
+def load_face_image(path):
+    """
+    Loads a face image as RGBA from a URL or a local file.
+    Returns a plain red fallback image if the load fails.
+    """
     try:
-        if path.startswith("http:"):
-            print(f"Loading texture from URL: {path}")
-            response = requests.get(path)
-            img = Image.open(BytesIO(response.content))
-        else:
-            print(f"Loading texture from local file: {path}")
-            img = Image.open(path)
-            
-        img = img.convert("RGBA")
-        img_data = np.array(img, dtype=np.uint8).tobytes()
-        width, height = img.size
-        
-        texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, width, height, 0, 
-                     GL_RGBA, GL_UNSIGNED_BYTE, img_data)
-        
-        return texture
+        return open_image(path).convert("RGBA")
     except Exception as e:
         print(f"Failed to load texture from {path}: {e}, using fallback.")
-        # Create a simple colored fallback
-        fallback = np.zeros((256, 256, 4), dtype=np.uint8)
-        fallback[:, :, 0] = 255 # Red
-        fallback[:, :, 3] = 255 # Alpha
-        texture = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, texture)
-        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, 256, 256, 0, GL_RGBA, GL_UNSIGNED_BYTE, fallback)
-        return texture
+        return Image.new("RGBA", (256, 256), (255, 0, 0, 255))
+
 
+def load_texture_atlas(paths, cols, rows, cell_size):
+    """
+    Packs the face images into a single cols x rows atlas texture,
+    image i going to cell (i % cols, i // cols). Every image is scaled to a cell_size square.
+    Images that fail to load are replaced with a red cell.
+    """
+    images = [load_face_image(path) for path in paths]
 
+    atlas = Image.new("RGBA", (cols * cell_size, rows * cell_size))
+    for i, img in enumerate(images):
+        col, row = i % cols, i // cols
+        cell = img.resize((cell_size, cell_size), Image.Resampling.LANCZOS)
+        atlas.paste(cell, (col * cell_size, row * cell_size))
+
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+    # Clamp rather than repeat so faces on the atlas border don't sample the opposite edge
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, atlas.width, atlas.height, 0,
+                 GL_RGBA, GL_UNSIGNED_BYTE, atlas.tobytes())
+    return texture
+
+
+@functools.lru_cache(maxsize=None)
 def load_env_texture(path):
     """
     Loads an environment map (matcap) texture from a URL.
@@ -85,7 +98,7 @@ def load_env_texture(path):
         #response = requests.get(url)
         #img = Image.open(BytesIO(response.content))
         img = img.convert("RGB").resize((512, 512))
-        img_data = np.array(img, dtype=np.uint8)
+        img_data = img.tobytes()
         
         texture = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, texture)
@@ -97,10 +110,12 @@ def load_env_texture(path):
         return texture
     except Exception as e:
         print(f"Failed to load environment texture from URL: {e}, using fallback.")
-        fallback = np.zeros((512, 512, 3), dtype=np.uint8)
-        for y in range(512):
-            for x in range(512):
-                fallback[y, x] = [x // 2, y // 2, 128]
+        # Red ramps along x, green along y, constant blue
+        ramp = (np.arange(512) // 2).astype(np.uint8)
+        fallback = np.empty((512, 512, 3), dtype=np.uint8)
+        fallback[:, :, 0] = ramp[None, :]
+        fallback[:, :, 1] = ramp[:, None]
+        fallback[:, :, 2] = 128
         texture = glGenTextures(1)
         glBindTexture(GL_TEXTURE_2D, texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, 512, 512, 0, GL_RGB, GL_UNSIGNED_BYTE, fallback)
@@ -143,21 +158,83 @@ cube_faces = {
     )
 }
 
+# --- Cube Vertex Buffer ---
+# All 24 vertices (4 per face, in cube_faces order) interleaved as
+# position (3 floats), normal (3 floats), texture coordinates (2 floats)
+VERTEX_STRIDE = 8 * 4
+
+# The face textures are packed into one atlas, face i in cell (i % cols, i // cols),
+# each cell a square of ATLAS_CELL_SIZE texels
+ATLAS_COLS, ATLAS_ROWS = 3, 2
+ATLAS_CELL_SIZE = 512
+
+
+def create_cube_vbo():
+    """Upload the cube geometry once to a vertex buffer object, with UVs mapped into the atlas."""
+    vertex_data = []
+    for i, (vertices, normal, tex_coords) in enumerate(cube_faces.values()):
+        col, row = i % ATLAS_COLS, i // ATLAS_COLS
+        # Inset by half a texel so linear filtering never samples the neighbouring cell
+        half_texel = 0.5 / ATLAS_CELL_SIZE
+        cell_coords = half_texel + tex_coords * (1 - 2 * half_texel)
+        atlas_coords = (cell_coords + (col, row)) / (ATLAS_COLS, ATLAS_ROWS)
+        for j in range(4):
+            vertex_data.append(np.concatenate((vertices[j], normal, atlas_coords[j])))
+    vertex_data = np.array(vertex_data, dtype=np.float32)
+
+    vbo = glGenBuffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+    glBufferData(GL_ARRAY_BUFFER, vertex_data.nbytes, vertex_data, GL_STATIC_DRAW)
+    return vbo
+
+
+def bind_cube_vbo(vbo):
+    """
+    Point the fixed-function vertex, normal and texture unit 0 coordinate arrays at the VBO.
+    The cube is the only geometry drawn, so this state is set once and left enabled.
+    """
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(0))
+    glEnableClientState(GL_NORMAL_ARRAY)
+    glNormalPointer(GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(3 * 4))
+    glClientActiveTexture(GL_TEXTURE0)
+    glEnableClientState(GL_TEXTURE_COORD_ARRAY)
+    glTexCoordPointer(2, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(6 * 4))
+
+
+def compile_cube_display_list():
+    """
+    Record the cube draw into a display list so each frame replays it with a single glCallList.
+    Texture binds and material state stay outside the list, so both rendering modes can share it.
+    """
+    list_id = glGenLists(1)
+    glNewList(list_id, GL_COMPILE)
+    glDrawArrays(GL_QUADS, 0, 24)
+    glEndList()
+    return list_id
+
+
+cube_vbo = create_cube_vbo()
+bind_cube_vbo(cube_vbo)
+cube_display_list = compile_cube_display_list()
+
 # --- Load Textures ---
 env_texture = load_env_texture(
 #     "https://images.unsplash.com/photo-1626908013943-df94de54984c?ixlib=rb-1.2.1&ixid=MnwxMjA3fDB8MHxwaG90by1wYWdlfHx8fGVufDB8fHx8&auto=format&fit=crop&w=512&h=512&q=80"
  "texture_uns.jpg"
 )
 
-# Textures and normal maps for individual faces (using placeholder URLs)
-face_color_textures = [
-    load_texture("texture_uns.png"),     # Top face
-    load_texture("texture_uns.png"),  # Bottom face
-    load_texture("1_stop_starting.png"),   # Front face
-    load_texture("2.cross.png"),   # Right face
-    load_texture("2.png"),     # Left face
-    load_texture("3_all.png")    # Back face
+# Textures for individual faces, packed into a single atlas texture
+face_texture_paths = [
+    "texture_uns.png",     # Top face
+    "texture_uns.png",  # Bottom face
+    "1_stop_starting.png",   # Front face
+    "2.cross.png",   # Right face
+    "2.png",     # Left face
+    "3_all.png"    # Back face
 ]
+face_atlas_texture = load_texture_atlas(face_texture_paths, ATLAS_COLS, ATLAS_ROWS, ATLAS_CELL_SIZE)
 
 
 
@@ -172,9 +249,21 @@ def set_metallic_material():
     glMaterialfv(GL_FRONT, GL_EMISSION, (0.1, 0.1, 0.1, 1.0))
 
 
-def draw_cube_textured_faces():
-    """Draw the cube with a different color texture on each face."""
+def setup_textured_mode():
+    """
+    Configure GL state once for drawing the cube with a different color texture on each face.
+    Called when switching to this mode, not every frame.
+    """
+    # Turn off the environment map unit used by the combined mode
+    glActiveTexture(GL_TEXTURE1)
+    glDisable(GL_TEXTURE_GEN_S)
+    glDisable(GL_TEXTURE_GEN_T)
+    glDisable(GL_TEXTURE_2D)
+
+    glActiveTexture(GL_TEXTURE0)
     glEnable(GL_TEXTURE_2D)
+    glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+    glBindTexture(GL_TEXTURE_2D, face_atlas_texture)
     
     # Set up a non-metallic material for this mode
     glMaterialfv(GL_FRONT, GL_DIFFUSE, (0.8, 0.8, 0.8, 1.0))
@@ -182,31 +271,21 @@ def draw_cube_textured_faces():
     glMaterialf(GL_FRONT, GL_SHININESS, 30.0)
     glMaterialfv(GL_FRONT, GL_EMISSION, (0.0, 0.0, 0.0, 1.0))
 
-    face_keys = list(cube_faces.keys())
-    for i in range(6):
-        glBindTexture(GL_TEXTURE_2D, face_color_textures[i])
-        vertices, normal, tex_coords = cube_faces[face_keys[i]]
-        glBegin(GL_QUADS)
-        for j in range(4):
-            glTexCoord2fv(tex_coords[j])
-            glNormal3fv(normal)
-            glVertex3fv(vertices[j])
-        glEnd()
-    glDisable(GL_TEXTURE_2D)
 
-
-def draw_cube_shiny_and_textured():
+def setup_combined_mode():
     """
-    Draw the cube with both a base color texture and an environment map for a shiny look.
-    This uses multi-texturing to blend the two effects correctly.
+    Configure GL state once for drawing the cube with both a base color texture and an
+    environment map for a shiny look. This uses multi-texturing to blend the two effects correctly.
+    Called when switching to this mode, not every frame.
     """
     set_metallic_material()
     
-    # Configure texture unit 0 for the base color texture
+    # Configure texture unit 0 for the base color texture (the face atlas)
     glActiveTexture(GL_TEXTURE0)
     glEnable(GL_TEXTURE_2D)
     # The primary texture is modulated with the lighting color
     glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
+    glBindTexture(GL_TEXTURE_2D, face_atlas_texture)
     
     # Configure texture unit 1 for the environment map
     glActiveTexture(GL_TEXTURE1)
@@ -224,29 +303,20 @@ def draw_cube_shiny_and_textured():
     glTexEnvi(GL_TEXTURE_ENV, GL_SOURCE0_RGB, GL_PREVIOUS)
     glTexEnvi(GL_TEXTURE_ENV, GL_SOURCE1_RGB, GL_TEXTURE)
     
-    face_keys = list(cube_faces.keys())
-    for i in range(6):
-        # Bind the color texture for the current face to texture unit 0
-        glActiveTexture(GL_TEXTURE0)
-        glBindTexture(GL_TEXTURE_2D, face_color_textures[i])
-        
-        vertices, normal, tex_coords = cube_faces[face_keys[i]]
-        glBegin(GL_QUADS)
-        for j in range(4):
-            glMultiTexCoord2fv(GL_TEXTURE0, tex_coords[j])
-            glNormal3fv(normal)
-            glVertex3fv(vertices[j])
-        glEnd()
-    
-    # Clean up state to avoid conflicts with other rendering modes
-    glDisable(GL_TEXTURE_GEN_S)
-    glDisable(GL_TEXTURE_GEN_T)
-    
-    glActiveTexture(GL_TEXTURE1)
-    glDisable(GL_TEXTURE_2D)
-    
     glActiveTexture(GL_TEXTURE0)
-    glDisable(GL_TEXTURE_2D)
+
+
+def setup_render_mode(use_combined_effect):
+    """Switch the GL state to the combined shiny/textured mode or the textured faces mode."""
+    if use_combined_effect:
+        setup_combined_mode()
+    else:
+        setup_textured_mode()
+
+
+def draw_cube():
+    """Draw the cube with whatever textures and material the current rendering mode set up."""
+    glCallList(cube_display_list)
 
 
 # --- Main Loop ---
@@ -262,6 +332,8 @@ glLightfv(GL_LIGHT0, GL_AMBIENT, (0.2, 0.2, 0.2, 1))
 glLightfv(GL_LIGHT0, GL_DIFFUSE, (0.8, 0.8, 0.8, 1))
 glLightfv(GL_LIGHT0, GL_SPECULAR, (1.0, 1.0, 1.0, 1))
 
+setup_render_mode(use_combined_effect)
+
 running = True
 while running:
     for event in pygame.event.get():
@@ -273,6 +345,7 @@ while running:
             # Toggle between rendering modes
             elif event.key == pygame.K_t:
                 use_combined_effect = not use_combined_effect
+                setup_render_mode(use_combined_effect)
                 print("Rendering mode toggled:", "Combined Shiny/Textured" if use_combined_effect else "Textured Faces")
             # Adjust rotation speed
             elif event.key == pygame.K_UP:
@@ -308,10 +381,7 @@ while running:
     rotation_z += rotation_speed * 0.3
     glRotatef(rotation_z, 0, 0, 1)
 
-    if use_combined_effect:
-        draw_cube_shiny_and_textured()
-    else:
-        draw_cube_textured_faces()
+    draw_cube()
     
     pygame.display.flip()
     clock.tick(60)